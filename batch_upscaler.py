@@ -0,0 +1,275 @@
+import multiprocessing as mp
+import os
+import queue
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from main import SimplePolarizationUpscaler
+
+
+class SharedFrameRing:
+    def __init__(self, slots, slot_bytes):
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, slots * slot_bytes))
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def offset(self, slot):
+        return slot * self.slot_bytes
+
+    def view(self, slot, shape, dtype=np.uint8):
+        return np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=self.offset(slot))
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+def _worker_loop(worker_id, tasks, done):
+    upscaler = SimplePolarizationUpscaler()
+    segments = {}
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+
+        (job, slot, in_name, in_offset, in_shape, in_dtype,
+         out_name, out_offset, out_shape, scale, mode) = task
+
+        if in_name not in segments or out_name not in segments:
+            for shm in segments.values():
+                shm.close()
+            # O resource_tracker é o do processo principal (ver start()), que é
+            # quem remove os anéis; anexar aqui não cria um segundo dono.
+            segments = {in_name: shared_memory.SharedMemory(name=in_name),
+                        out_name: shared_memory.SharedMemory(name=out_name)}
+
+        start = time.perf_counter()
+        error = None
+        try:
+            frame = np.ndarray(in_shape, dtype=in_dtype,
+                               buffer=segments[in_name].buf, offset=in_offset)
+            target = np.ndarray(out_shape, dtype=np.uint8,
+                                buffer=segments[out_name].buf, offset=out_offset)
+            upscaler.polarization_upscale(frame, scale=scale, mode=mode, out=target)
+            del frame, target
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+
+        done.put((job, slot, worker_id, time.perf_counter() - start, error))
+
+    for shm in segments.values():
+        shm.close()
+
+
+class SharedMemoryBatchUpscaler:
+    join_timeout = 5.0
+
+    def __init__(self, workers=None, slots_per_worker=2):
+        self.workers = workers or os.cpu_count() or 1
+        self.slots_per_worker = max(1, slots_per_worker)
+        self.last_stats = None
+
+        self._ctx = mp.get_context()
+        self._processes = []
+        self._tasks = None
+        self._done = None
+        self._in_ring = None
+        self._out_ring = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def start(self):
+        if self._processes and all(p.is_alive() for p in self._processes):
+            return self
+        if self._processes:
+            self._terminate_pool()
+
+        # Iniciado antes dos workers para que todos herdem o mesmo tracker; do
+        # contrário cada worker criaria o seu e removeria os anéis ao encerrar.
+        resource_tracker.ensure_running()
+
+        self._tasks = self._ctx.Queue()
+        self._done = self._ctx.Queue()
+        for worker_id in range(self.workers):
+            process = self._ctx.Process(
+                target=_worker_loop,
+                args=(worker_id, self._tasks, self._done),
+                daemon=True
+            )
+            process.start()
+            self._processes.append(process)
+
+        return self
+
+    def _terminate_pool(self):
+        # Um worker morto pode ter levado consigo o lock de leitura da fila de
+        # tarefas; as filas não são reaproveitáveis e os demais são encerrados.
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+        for process in self._processes:
+            process.join(timeout=self.join_timeout)
+        self._processes = []
+        self._discard_queues()
+
+    def _discard_queues(self):
+        for q in (self._tasks, self._done):
+            if q is not None:
+                q.close()
+                q.cancel_join_thread()
+        self._tasks = None
+        self._done = None
+
+    def close(self):
+        try:
+            for _ in self._processes:
+                self._tasks.put(None)
+            for process in self._processes:
+                process.join(timeout=self.join_timeout)
+            for process in self._processes:
+                if process.is_alive():
+                    process.terminate()
+                    process.join(timeout=self.join_timeout)
+            self._processes = []
+            self._discard_queues()
+        finally:
+            for ring in (self._in_ring, self._out_ring):
+                if ring is not None:
+                    ring.close()
+            self._in_ring = None
+            self._out_ring = None
+
+    def _ensure_rings(self, in_bytes, out_bytes):
+        slots = self.workers * self.slots_per_worker
+
+        if self._in_ring is None or self._in_ring.slot_bytes < in_bytes:
+            if self._in_ring is not None:
+                self._in_ring.close()
+            self._in_ring = SharedFrameRing(slots, in_bytes)
+
+        if self._out_ring is None or self._out_ring.slot_bytes < out_bytes:
+            if self._out_ring is not None:
+                self._out_ring.close()
+            self._out_ring = SharedFrameRing(slots, out_bytes)
+
+        return slots
+
+    def _wait_result(self):
+        while True:
+            try:
+                return self._done.get(timeout=1.0)
+            except queue.Empty:
+                dead = [p.pid for p in self._processes if not p.is_alive()]
+                if dead:
+                    # O pool é recriado no próximo run(); as tarefas em voo se perdem.
+                    self._terminate_pool()
+                    raise RuntimeError(f"Worker(s) encerrado(s) inesperadamente: {dead}")
+
+    def _drain(self, pending):
+        for _ in range(pending):
+            self._wait_result()
+
+    def run(self, frames, scale=2, on_result=None, mode='exact'):
+        if mode not in SimplePolarizationUpscaler.modes:
+            raise ValueError(f"Modo desconhecido: {mode!r} (use um de {SimplePolarizationUpscaler.modes})")
+        self.start()
+
+        frames = [np.ascontiguousarray(frame) for frame in frames]
+        if not frames:
+            self.last_stats = None
+            return []
+
+        out_shapes = [(frame.shape[0] * scale, frame.shape[1] * scale) for frame in frames]
+        slots = self._ensure_rings(
+            max(frame.nbytes for frame in frames),
+            max(h * w for h, w in out_shapes)
+        )
+
+        results = [None] * len(frames)
+        free_slots = list(range(slots))
+        busy = [0.0] * self.workers
+        processed = [0] * self.workers
+        next_job = 0
+        pending = 0
+        start = time.perf_counter()
+
+        try:
+            while next_job < len(frames) or pending:
+                while free_slots and next_job < len(frames):
+                    slot = free_slots.pop()
+                    frame = frames[next_job]
+
+                    self._in_ring.view(slot, frame.shape, frame.dtype)[...] = frame
+                    self._tasks.put((
+                        next_job, slot,
+                        self._in_ring.name, self._in_ring.offset(slot), frame.shape, frame.dtype.str,
+                        self._out_ring.name, self._out_ring.offset(slot), out_shapes[next_job],
+                        scale, mode
+                    ))
+                    next_job += 1
+                    pending += 1
+
+                job, slot, worker_id, elapsed, error = self._wait_result()
+                pending -= 1
+                if error is not None:
+                    raise RuntimeError(f"Erro no quadro {job} (worker {worker_id}): {error}")
+
+                busy[worker_id] += elapsed
+                processed[worker_id] += 1
+
+                output = self._out_ring.view(slot, out_shapes[job])
+                try:
+                    if on_result is not None:
+                        on_result(job, output)
+                    else:
+                        results[job] = output.copy()
+                finally:
+                    del output
+                free_slots.append(slot)
+        except BaseException:
+            # Tarefas ainda em voo escreveriam nos slots do próximo lote e suas
+            # mensagens seriam lidas como dele; esvazia antes de propagar o erro.
+            if self._processes:
+                self._drain(pending)
+            raise
+
+        wall = time.perf_counter() - start
+        self.last_stats = {
+            'frames': len(frames),
+            'wall_time': wall,
+            'frames_per_second': len(frames) / wall if wall > 0 else 0.0,
+            'workers': [
+                {
+                    'worker': worker_id,
+                    'frames': processed[worker_id],
+                    'busy_time': busy[worker_id],
+                    'utilization': busy[worker_id] / wall if wall > 0 else 0.0
+                }
+                for worker_id in range(self.workers)
+            ]
+        }
+
+        return None if on_result is not None else results
+
+    def print_utilization(self):
+        if self.last_stats is None:
+            print("Nenhum lote processado ainda.")
+            return
+
+        stats = self.last_stats
+        print(f"Quadros: {stats['frames']} em {stats['wall_time']:.3f}s "
+              f"({stats['frames_per_second']:.1f} quadros/s)")
+        for worker in stats['workers']:
+            print(f"  Worker {worker['worker']:>2}: {worker['frames']:>4} quadros, "
+                  f"ocupado {worker['busy_time']:.3f}s ({worker['utilization'] * 100:.1f}%)")
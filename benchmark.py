@@ -0,0 +1,251 @@
+import os
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from main import SimplePolarizationUpscaler
+
+
+def make_frames(count, size=(480, 640), seed=0):
+    rng = np.random.default_rng(seed)
+    h, w = size
+    frames = []
+    for _ in range(count):
+        frame = rng.integers(0, 256, (h, w), dtype=np.uint8)
+        frames.append(cv2.GaussianBlur(frame, (5, 5), 1.5))
+    return frames
+
+
+def benchmark_batch_scaling(count=64, size=(480, 640), scale=2, worker_counts=None):
+    from batch_upscaler import SharedMemoryBatchUpscaler
+
+    print("=== Benchmark: Lote em Processos com Memória Compartilhada ===")
+
+    frames = make_frames(count, size)
+    if worker_counts is None:
+        cpus = os.cpu_count() or 1
+        worker_counts = sorted({1, 2, 4, 8, 16, 32, 64, cpus})
+        worker_counts = [n for n in worker_counts if n <= cpus]
+
+    upscaler = SimplePolarizationUpscaler()
+    start = time.perf_counter()
+    for frame in frames:
+        upscaler.polarization_upscale(frame, scale=scale)
+    serial = time.perf_counter() - start
+    print(f"Serial: {serial:.3f}s ({count / serial:.1f} quadros/s)")
+
+    for workers in worker_counts:
+        with SharedMemoryBatchUpscaler(workers=workers) as runner:
+            runner.run(frames[:workers], scale=scale)
+            runner.run(frames, scale=scale)
+            wall = runner.last_stats['wall_time']
+            print(f"\n{workers} worker(s): {wall:.3f}s, aceleração {serial / wall:.2f}x "
+                  f"(eficiência {serial / wall / workers * 100:.0f}%)")
+            runner.print_utilization()
+
+
+def _best_time(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def benchmark_fast_mode(sizes=((2160, 3840), (2880, 5120)), scale=2, repeat=3):
+    print("=== Benchmark: Modo Rápido (LUT) vs Exato ===")
+    print("Frio: instância nova a cada quadro (padrões sintetizados do zero).")
+    print("Quente: mesma instância, padrões já em cache (quadros repetidos do mesmo tamanho).")
+
+    for h, w in sizes:
+        frame = make_frames(1, (h, w))[0]
+        gray = frame.astype(np.float32)
+        print(f"\nQuadro {w}x{h}:")
+
+        warm = SimplePolarizationUpscaler()
+        for mode in SimplePolarizationUpscaler.modes:
+            warm.polarization_upscale(frame, scale=scale, mode=mode)
+
+        def info(mode, upscaler=None):
+            return (upscaler or SimplePolarizationUpscaler()).get_polarization_info(gray, mode)
+
+        def upscale(mode, enhance_lut=False, upscaler=None):
+            return (upscaler or SimplePolarizationUpscaler()).polarization_upscale(
+                frame, scale=scale, mode=mode, enhance_lut=enhance_lut)
+
+        for state, upscaler in (("frio", None), ("quente", warm)):
+            exact_time, exact_map = _best_time(lambda: info('exact', upscaler), repeat)
+            fast_time, fast_map = _best_time(lambda: info('fast', upscaler), repeat)
+            print(f"  [{state}] Mapa de polarização  exato: {exact_time:.3f}s | rápido: {fast_time:.3f}s "
+                  f"({exact_time / fast_time:.2f}x), erro máx. {np.abs(exact_map - fast_map).max():.2e}")
+
+            exact_time, exact_out = _best_time(lambda: upscale('exact', upscaler=upscaler), repeat)
+            for label, mode, enhance_lut in (("rápido", 'fast', False), ("rápido + LUT", 'fast', True)):
+                elapsed, out = _best_time(lambda: upscale(mode, enhance_lut, upscaler), repeat)
+                error = np.abs(exact_out.astype(np.int16) - out).max()
+                print(f"  [{state}] Ampliação {scale}x  exato: {exact_time:.3f}s | {label}: {elapsed:.3f}s "
+                      f"({exact_time / elapsed:.2f}x), erro máx. {error} nível(is)")
+
+
+def legacy_polarization_upscale(upscaler, image, scale=2):
+    # Cópia da implementação anterior à fusão do mapa, mantida como referência.
+    if len(image.shape) == 3:
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    else:
+        gray = image.copy()
+    
+    image = gray.astype(np.float32)
+    pol_0 = upscaler.polarization_filter(image, 0)
+    pol_90 = upscaler.polarization_filter(image, 90)
+    polarization_strength = np.abs(pol_0 - pol_90)
+    if np.max(polarization_strength) > 0:
+        polarization_strength = polarization_strength / np.max(polarization_strength)
+    pol_map = polarization_strength
+    
+    h, w = gray.shape
+    new_size = (w * scale, h * scale)
+    upscaled = cv2.resize(gray, new_size, interpolation=cv2.INTER_CUBIC)
+    pol_map_large = cv2.resize(pol_map, new_size, interpolation=cv2.INTER_CUBIC)
+    
+    enhancement = 1 + pol_map_large * 0.3
+    enhanced = upscaled.astype(np.float32) * enhancement
+    return np.clip(enhanced, 0, 255).astype(np.uint8)
+
+
+def _legacy_passes(upscaler, gray, scale):
+    h, w = gray.shape
+    new_size = (w * scale, h * scale)
+    p0 = upscaler.polarization_pattern(h, w, 0)
+    p90 = upscaler.polarization_pattern(h, w, 90)
+    st = {}
+
+    def run(key, value, *operands):
+        st[key] = value
+        return sum(a.nbytes for a in operands) + (value.nbytes if isinstance(value, np.ndarray) else 0)
+
+    return [
+        ("cópia da entrada", lambda: run('gray', gray.copy(), gray)),
+        ("astype float32", lambda: run('f', st['gray'].astype(np.float32), st['gray'])),
+        ("filtro 0°", lambda: run('pol_0', st['f'] * p0, st['f'], p0)),
+        ("filtro 90°", lambda: run('pol_90', st['f'] * p90, st['f'], p90)),
+        ("diferença", lambda: run('diff', st['pol_0'] - st['pol_90'], st['pol_0'], st['pol_90'])),
+        ("abs", lambda: run('abs', np.abs(st['diff']), st['diff'])),
+        ("max (1)", lambda: run('max', np.max(st['abs']), st['abs'])),
+        ("max (2)", lambda: run('max', np.max(st['abs']), st['abs'])),
+        ("normalização", lambda: run('map', st['abs'] / st['max'], st['abs'])),
+        ("resize imagem", lambda: run('up', cv2.resize(gray, new_size, interpolation=cv2.INTER_CUBIC), gray)),
+        ("resize mapa", lambda: run('large', cv2.resize(st['map'], new_size, interpolation=cv2.INTER_CUBIC), st['map'])),
+        ("mapa * 0.3", lambda: run('scaled', st['large'] * 0.3, st['large'])),
+        ("1 + mapa", lambda: run('enh', 1 + st['scaled'], st['scaled'])),
+        ("astype float32 (ampliada)", lambda: run('upf', st['up'].astype(np.float32), st['up'])),
+        ("realce", lambda: run('out', st['upf'] * st['enh'], st['upf'], st['enh'])),
+        ("clip", lambda: run('out', np.clip(st['out'], 0, 255), st['out'])),
+        ("astype uint8", lambda: run('res', st['out'].astype(np.uint8), st['out'])),
+    ]
+
+
+def _fused_passes(upscaler, gray, scale):
+    h, w = gray.shape
+    new_size = (w * scale, h * scale)
+    difference = upscaler._pattern_difference(h, w, 'exact')
+    st = {}
+
+    def run(key, value, *operands):
+        st[key] = value
+        written = value.nbytes if isinstance(value, np.ndarray) else 0
+        return sum(a.nbytes for a in operands) + written
+
+    def scale_in_place():
+        st['enh'] *= upscaler.ENHANCEMENT_FACTOR / st['peak']
+        return 2 * st['enh'].nbytes
+
+    def add_one():
+        st['enh'] += 1
+        return 2 * st['enh'].nbytes
+
+    def enhance():
+        np.multiply(st['large'], st['up'], out=st['large'])
+        return 2 * st['large'].nbytes + st['up'].nbytes
+
+    def clip():
+        np.clip(st['large'], 0, 255, out=st['large'])
+        return 2 * st['large'].nbytes
+
+    return [
+        ("força = I·|P0 − P90|", lambda: run('enh', np.multiply(gray, difference, dtype=np.float64), gray, difference)),
+        ("max", lambda: run('peak', st['enh'].max(), st['enh'])),
+        ("multiplicador (in-place)", scale_in_place),
+        ("1 + mapa (in-place)", add_one),
+        ("resize imagem", lambda: run('up', cv2.resize(gray, new_size, interpolation=cv2.INTER_CUBIC), gray)),
+        ("resize mapa", lambda: run('large', cv2.resize(st['enh'], new_size, interpolation=cv2.INTER_CUBIC), st['enh'])),
+        ("realce (in-place)", enhance),
+        ("clip (in-place)", clip),
+        ("astype uint8", lambda: run('res', st['large'].astype(np.uint8), st['large'])),
+    ]
+
+
+def _print_passes(title, passes):
+    print(f"  {title}:")
+    total_bytes = 0
+    total_time = 0.0
+    for label, func in passes:
+        start = time.perf_counter()
+        traffic = func()
+        elapsed = time.perf_counter() - start
+        total_bytes += traffic
+        total_time += elapsed
+        print(f"    {label:<28} {traffic / 2**20:9.1f} MiB  {elapsed * 1000:8.2f} ms")
+    print(f"    {'TOTAL (' + str(len(passes)) + ' passadas)':<28} {total_bytes / 2**20:9.1f} MiB  "
+          f"{total_time * 1000:8.2f} ms")
+
+
+def _peak_memory(func):
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def benchmark_fused_map(size=(2160, 3840), scale=2, repeat=3):
+    print("=== Benchmark: Mapa Fundido vs Implementação Anterior ===")
+    print("Tráfego estimado por passada = bytes lidos + escritos (padrões em cache).")
+
+    frame = make_frames(1, size)[0]
+    upscaler = SimplePolarizationUpscaler()
+    upscaler.polarization_upscale(frame, scale=scale)
+    print(f"\nQuadro {size[1]}x{size[0]}, ampliação {scale}x")
+
+    _print_passes("Anterior", _legacy_passes(upscaler, frame, scale))
+    _print_passes("Fundido", _fused_passes(upscaler, frame, scale))
+
+    legacy_time, legacy_out = _best_time(
+        lambda: legacy_polarization_upscale(upscaler, frame, scale), repeat)
+    fused_time, fused_out = _best_time(
+        lambda: upscaler.polarization_upscale(frame, scale=scale), repeat)
+    legacy_peak = _peak_memory(lambda: legacy_polarization_upscale(upscaler, frame, scale))
+    fused_peak = _peak_memory(lambda: upscaler.polarization_upscale(frame, scale=scale))
+    error = np.abs(legacy_out.astype(np.int16) - fused_out).max()
+
+    print(f"\n  Tempo total   anterior: {legacy_time:.3f}s | fundido: {fused_time:.3f}s "
+          f"({legacy_time / fused_time:.2f}x)")
+    print(f"  Pico de memória temporária   anterior: {legacy_peak / 2**20:.1f} MiB | "
+          f"fundido: {fused_peak / 2**20:.1f} MiB")
+    print(f"  Diferença máxima: {error} nível(is)")
+
+
+if __name__ == "__main__":
+    import sys
+
+    benchmarks = {
+        'batch': benchmark_batch_scaling,
+        'fast': benchmark_fast_mode,
+        'fused': benchmark_fused_map,
+    }
+    selected = sys.argv[1:] or list(benchmarks)
+    for name in selected:
+        benchmarks[name]()
+        print()
@@ -103,7 +103,7 @@ class ImageTestCases:
         return bad_cases
 
 def comprehensive_test():
-    from polarization_image_enhancement import SimplePolarizationUpscaler
+    from main import SimplePolarizationUpscaler
     
     test_cases = ImageTestCases()
     good_cases = test_cases.create_good_cases()
@@ -134,7 +134,8 @@ def comprehensive_test():
     good_results = {}
     for name, case in good_cases.items():
         img = case['image']
-        enhanced, pol_map = upscaler.polarization_upscale(img, scale=2)
+        enhanced = upscaler.polarization_upscale(img, scale=2)
+        pol_map = upscaler.get_polarization_info(img)
         conventional = upscaler.conventional_upscale(img, scale=2)
         
         metrics = calculate_metrics(img, enhanced, conventional)
@@ -157,7 +158,8 @@ def comprehensive_test():
     bad_results = {}
     for name, case in bad_cases.items():
         img = case['image']
-        enhanced, pol_map = upscaler.polarization_upscale(img, scale=2)
+        enhanced = upscaler.polarization_upscale(img, scale=2)
+        pol_map = upscaler.get_polarization_info(img)
         conventional = upscaler.conventional_upscale(img, scale=2)
         
         metrics = calculate_metrics(img, enhanced, conventional)
@@ -296,7 +298,8 @@ def test_with_real_images():
         img = cv2.resize(img, (new_width, 200))
     
     upscaler = SimplePolarizationUpscaler()
-    enhanced, pol_map = upscaler.polarization_upscale(img)
+    enhanced = upscaler.polarization_upscale(img)
+    pol_map = upscaler.get_polarization_info(img)
     conventional = upscaler.conventional_upscale(img)
     
     """)
@@ -6,51 +6,196 @@ import tkinter as tk
 import os
 
 class SimplePolarizationUpscaler:
-    def polarization_filter(self, image, angle_deg):
-        h, w = image.shape
+    max_cached_patterns = 8
+    modes = ('exact', 'fast')
+    
+    # Modo "fast": sin² tem período π, então ângulos não alinhados aos eixos
+    # usam uma tabela de PHASE_LUT_SIZE amostras indexada pela fase módulo π.
+    # Erro máximo do padrão: π / (4 * PHASE_LUT_SIZE) ≈ 1.9e-4 (≈ 0.05 nível
+    # de cinza no filtro). Em 0°/90° o padrão depende de uma única coordenada
+    # e vem de uma tabela 1D do tamanho da linha/coluna, sem erro adicional.
+    PHASE_LUT_SIZE = 4096
+    
+    # LUT opcional do realce final (entrada uint8): o mapa de realce é
+    # quantizado em 256 níveis; erro máximo de 1 nível. Não é uma aceleração:
+    # em 4K empata com o caminho em ponto flutuante e em quadros pequenos é
+    # um pouco mais lenta, pois o custo fica nas interpolações bicúbicas.
+    ENHANCEMENT_LUT_LEVELS = 256
+    
+    ENHANCEMENT_FACTOR = 0.3
+
+    def __init__(self):
+        # Padrões dependem apenas de (altura, largura, ângulo); reaproveitá-los
+        # evita recalcular np.sin sobre a imagem inteira a cada quadro.
+        self._pattern_cache = {}
+        self._phase_lut = None
+        self._enhancement_lut = None
+
+    def _check_mode(self, mode):
+        if mode not in self.modes:
+            raise ValueError(f"Modo desconhecido: {mode!r} (use um de {self.modes})")
+
+    def _fast_pattern(self, h, w, angle_rad):
+        c = np.cos(angle_rad)
+        s = np.sin(angle_rad)
+        
+        if abs(s) < 1e-12:
+            return np.sin(np.arange(w) * c)[np.newaxis, :] ** 2
+        if abs(c) < 1e-12:
+            return np.sin(np.arange(h) * s)[:, np.newaxis] ** 2
+        
+        if self._phase_lut is None:
+            phases = np.arange(self.PHASE_LUT_SIZE) * (np.pi / self.PHASE_LUT_SIZE)
+            self._phase_lut = np.sin(phases) ** 2
+        
+        step = self.PHASE_LUT_SIZE / np.pi
+        row = np.arange(w) * (c * step)
+        col = np.arange(h) * (s * step)
+        index = np.rint(col[:, np.newaxis] + row[np.newaxis, :]).astype(np.int64)
+        index %= self.PHASE_LUT_SIZE
+        return self._phase_lut[index]
+
+    def _cache_pattern(self, key, pattern):
+        if len(self._pattern_cache) >= self.max_cached_patterns:
+            self._pattern_cache.clear()
+        self._pattern_cache[key] = pattern
+    
+    def _compute_pattern(self, h, w, angle_deg, mode):
         angle_rad = np.radians(angle_deg)
         
-        x = np.arange(w)
-        y = np.arange(h)
-        X, Y = np.meshgrid(x, y)
+        if mode == 'fast':
+            pattern = self._fast_pattern(h, w, angle_rad)
+        else:
+            x = np.arange(w)
+            y = np.arange(h)
+            X, Y = np.meshgrid(x, y)
+            
+            pattern = np.sin(X * np.cos(angle_rad) + Y * np.sin(angle_rad)) ** 2
         
-        pattern = np.sin(X * np.cos(angle_rad) + Y * np.sin(angle_rad)) ** 2
+        return 0.5 + 0.5 * pattern
+    
+    def polarization_pattern(self, h, w, angle_deg, mode='exact'):
+        self._check_mode(mode)
         
-        pattern = 0.5 + 0.5 * pattern
+        key = (h, w, angle_deg, mode)
+        pattern = self._pattern_cache.get(key)
+        if pattern is None:
+            pattern = self._compute_pattern(h, w, angle_deg, mode)
+            # Em 0°/90° o modo rápido gera uma linha ou coluna; a visão com
+            # broadcast mantém o formato (h, w) sem ocupar memória extra.
+            if pattern.shape != (h, w):
+                pattern = np.broadcast_to(pattern, (h, w))
+            self._cache_pattern(key, pattern)
         
-        return image * pattern
+        return pattern
     
-    def get_polarization_info(self, image):
-        pol_0 = self.polarization_filter(image, 0)
-        pol_90 = self.polarization_filter(image, 90)
+    def polarization_filter(self, image, angle_deg, mode='exact'):
+        h, w = image.shape
+        return image * self.polarization_pattern(h, w, angle_deg, mode)
+    
+    def _pattern_difference(self, h, w, mode):
+        # Só |P0 − P90| fica em cache: P0 e P90 são descartados após a subtração
+        # para não manter três matrizes do tamanho do quadro por worker.
+        key = (h, w, 'abs_diff', mode)
+        difference = self._pattern_cache.get(key)
+        if difference is None:
+            difference = np.subtract(self._compute_pattern(h, w, 0, mode),
+                                     self._compute_pattern(h, w, 90, mode))
+            np.abs(difference, out=difference)
+            self._cache_pattern(key, difference)
         
-        polarization_strength = np.abs(pol_0 - pol_90)
+        return difference
+    
+    def _polarization_strength(self, image, mode):
+        # |I·P0 − I·P90| = |I|·|P0 − P90|: com |P0 − P90| em cache, a força de
+        # polarização sai de uma única multiplicação sobre a imagem.
+        h, w = image.shape
+        strength = np.multiply(image, self._pattern_difference(h, w, mode),
+                               dtype=np.float64)
+        if image.dtype.kind != 'u':
+            np.abs(strength, out=strength)
+        return strength
+    
+    def get_polarization_info(self, image, mode='exact'):
+        self._check_mode(mode)
+        
+        polarization_strength = self._polarization_strength(image, mode)
         
-        if np.max(polarization_strength) > 0:
-            polarization_strength = polarization_strength / np.max(polarization_strength)
+        peak = polarization_strength.max()
+        if peak > 0:
+            polarization_strength /= peak
         
         return polarization_strength
     
-    def polarization_upscale(self, image, scale=2):
+    def _enhancement_map(self, gray, mode):
+        # Normalização e fator de realce viram um único multiplicador aplicado
+        # in-place na resolução original. A interpolação bicúbica é linear, então
+        # redimensionar 1 + k·força dá o mesmo que redimensionar a força e realçar
+        # depois, a menos de arredondamento: após o truncamento para uint8 o
+        # resultado difere da implementação anterior em no máximo 1 nível.
+        enhancement = self._polarization_strength(gray, mode)
+        
+        peak = enhancement.max()
+        if peak > 0:
+            enhancement *= self.ENHANCEMENT_FACTOR / peak
+        enhancement += 1
+        
+        return enhancement
+    
+    def _enhance_with_lut(self, upscaled, enhancement, new_size, out=None):
+        levels = self.ENHANCEMENT_LUT_LEVELS
+        # A bicúbica 2D do OpenCV ultrapassa a faixa de entrada em no máximo
+        # ~45%; com o mapa em [0, 1] o realce fica em [1 - 0.5·fator, 1 + 1.5·fator].
+        lo = 1 - 0.5 * self.ENHANCEMENT_FACTOR
+        hi = 1 + 1.5 * self.ENHANCEMENT_FACTOR
+        
+        if self._enhancement_lut is None:
+            enhancement_levels = lo + np.arange(levels) * ((hi - lo) / (levels - 1))
+            pixels = np.arange(256, dtype=np.float32)[np.newaxis, :]
+            table = np.clip(pixels * enhancement_levels[:, np.newaxis], 0, 255).astype(np.uint8)
+            self._enhancement_lut = table.ravel()
+        
+        # Mapa em float32 e nível quantizado direto para uint8 (com saturação)
+        # numa única passada do OpenCV; o índice da tabela cabe em uint16.
+        enhancement = cv2.resize(enhancement.astype(np.float32), new_size,
+                                 interpolation=cv2.INTER_CUBIC)
+        step = (levels - 1) / (hi - lo)
+        level = cv2.convertScaleAbs(enhancement, alpha=step, beta=-lo * step)
+        
+        index = level.astype(np.uint16)
+        index <<= 8
+        index |= upscaled
+        return np.take(self._enhancement_lut, index, out=out)
+    
+    def polarization_upscale(self, image, scale=2, mode='exact', enhance_lut=False, out=None):
+        self._check_mode(mode)
+        
         if len(image.shape) == 3:
             gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         else:
-            gray = image.copy()
+            gray = image
         
-        pol_map = self.get_polarization_info(gray.astype(np.float32))
+        enhancement = self._enhancement_map(gray, mode)
         
         h, w = gray.shape
         new_size = (w * scale, h * scale)
         upscaled = cv2.resize(gray, new_size, interpolation=cv2.INTER_CUBIC)
         
-        pol_map_large = cv2.resize(pol_map, new_size, interpolation=cv2.INTER_CUBIC)
+        if enhance_lut and upscaled.dtype == np.uint8:
+            return self._enhance_with_lut(upscaled, enhancement, new_size, out)
+        
+        enhancement = cv2.resize(enhancement, new_size, interpolation=cv2.INTER_CUBIC)
         
-        enhancement = 1 + pol_map_large * 0.3
-        enhanced = upscaled.astype(np.float32) * enhancement
+        enhanced = np.multiply(enhancement, upscaled, out=enhancement)
         
-        enhanced = np.clip(enhanced, 0, 255).astype(np.uint8)
+        enhanced = np.clip(enhanced, 0, 255, out=enhanced)
         
-        return enhanced
+        # Com out (ex.: um slot de memória compartilhada), a conversão para
+        # uint8 escreve direto no destino, sem alocar um quadro intermediário.
+        if out is None:
+            return enhanced.astype(np.uint8)
+        np.copyto(out, enhanced, casting='unsafe')
+        return out
     
     def conventional_upscale(self, image, scale=2):
         if len(image.shape) == 3:
@@ -0,0 +1,29 @@
+import pytest
+
+from tests.equivalence import build_fixtures, load_golden, print_report, warm_up
+
+_results = []
+
+
+@pytest.fixture(scope='session')
+def fixtures():
+    fixtures = build_fixtures()
+    warm_up(fixtures)
+    return fixtures
+
+
+@pytest.fixture(scope='session')
+def golden():
+    return load_golden()
+
+
+@pytest.fixture(scope='session')
+def mode_results():
+    return _results
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _results:
+        return
+    terminalreporter.section("Modos do upscaler: tempo e erro contra as referências")
+    print_report(_results)
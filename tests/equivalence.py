@@ -0,0 +1,194 @@
+import argparse
+import atexit
+import os
+import time
+import unicodedata
+
+import numpy as np
+
+from benchmark import legacy_polarization_upscale
+from main import SimplePolarizationUpscaler, create_test_images
+from generate_image_test import ImageTestCases
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden', 'upscale_golden.npz')
+SCALES = (2, 3, 4)
+FIXTURE_SEED = 1234
+
+
+def _slug(name):
+    name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+    return name.strip().lower().replace(' ', '_')
+
+
+def build_fixtures():
+    # create_test_images e ImageTestCases usam np.random sem semente fixa.
+    np.random.seed(FIXTURE_SEED)
+    fixtures = {f"main_{_slug(name)}": img for name, img in create_test_images().items()}
+
+    np.random.seed(FIXTURE_SEED)
+    cases = ImageTestCases()
+    for name, case in {**cases.create_good_cases(), **cases.create_bad_cases()}.items():
+        fixtures[f"casos_{name}"] = case['image']
+
+    fixtures['cor_bgr'] = np.dstack([
+        fixtures['casos_bordas_nitidas'],
+        fixtures['casos_linhas_direcionais'],
+        fixtures['casos_textura_organica'],
+    ])
+
+    return fixtures
+
+
+def golden_key(name, scale):
+    return f"{name}__x{scale}"
+
+
+def _serial(mode, enhance_lut=False):
+    upscaler = SimplePolarizationUpscaler()
+
+    def run(frames, scale):
+        return [upscaler.polarization_upscale(frame, scale=scale, mode=mode, enhance_lut=enhance_lut)
+                for frame in frames]
+    return run
+
+
+_batch_runner = None
+
+
+def _batched(mode):
+    def run(frames, scale):
+        global _batch_runner
+        if _batch_runner is None:
+            from batch_upscaler import SharedMemoryBatchUpscaler
+
+            _batch_runner = SharedMemoryBatchUpscaler(workers=2).start()
+            atexit.register(_batch_runner.close)
+        return _batch_runner.run(frames, scale=scale, mode=mode)
+    return run
+
+
+# Tolerância = erro absoluto máximo em níveis de cinza contra a saída de
+# referência, gerada pela implementação original (anterior ao mapa fundido).
+# O mapa fundido e os padrões do modo rápido diferem dela só por
+# arredondamento (até 1 nível após o truncamento); a LUT do realce
+# acrescenta até 1 nível de quantização. Modos em lote também são comparados
+# com a saída serial do mesmo modo ('serial'), que precisam igualar bit a bit.
+MODES = {
+    'exact': {'run': _serial('exact'), 'tolerance': 1},
+    'fast': {'run': _serial('fast'), 'tolerance': 1},
+    'exact_lut': {'run': _serial('exact', enhance_lut=True), 'tolerance': 2},
+    'fast_lut': {'run': _serial('fast', enhance_lut=True), 'tolerance': 2},
+    'batch_exact': {'run': _batched('exact'), 'tolerance': 1, 'serial': 'exact'},
+    'batch_fast': {'run': _batched('fast'), 'tolerance': 1, 'serial': 'fast'},
+}
+
+
+def warm_up(fixtures):
+    # Inicia o pool em lote e preenche os caches de padrões de todos os modos
+    # fora da medição, para que os tempos reportados sejam de regime.
+    frames = list(fixtures.values())
+    for scale in SCALES:
+        for mode in MODES.values():
+            mode['run'](frames, scale)
+
+
+def generate_golden(fixtures):
+    upscaler = SimplePolarizationUpscaler()
+    golden = {}
+    for scale in SCALES:
+        for name, image in fixtures.items():
+            golden[golden_key(name, scale)] = legacy_polarization_upscale(upscaler, image, scale)
+    return golden
+
+
+def save_golden(golden, path=GOLDEN_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez_compressed(path, **golden)
+
+
+def load_golden(path=GOLDEN_PATH):
+    with np.load(path) as data:
+        return {key: data[key] for key in data.files}
+
+
+def run_mode(mode, fixtures, scale):
+    names = list(fixtures)
+    frames = [fixtures[name] for name in names]
+
+    start = time.perf_counter()
+    outputs = MODES[mode]['run'](frames, scale)
+    elapsed = time.perf_counter() - start
+
+    return elapsed, dict(zip(names, outputs))
+
+
+def max_abs_error(expected, actual):
+    if expected.shape != actual.shape:
+        return None
+    return int(np.abs(expected.astype(np.int16) - actual.astype(np.int16)).max())
+
+
+def compare_mode(mode, fixtures, golden, scale):
+    elapsed, outputs = run_mode(mode, fixtures, scale)
+    errors = {name: max_abs_error(golden[golden_key(name, scale)], output)
+              for name, output in outputs.items()}
+
+    serial_errors = None
+    if 'serial' in MODES[mode]:
+        _, serial = run_mode(MODES[mode]['serial'], fixtures, scale)
+        serial_errors = {name: max_abs_error(serial[name], output)
+                         for name, output in outputs.items()}
+
+    return elapsed, errors, serial_errors
+
+
+def _worst(errors):
+    if errors is None:
+        return '-'
+    if any(error is None for error in errors.values()):
+        return 'forma'
+    return max(errors.values())
+
+
+def print_report(results):
+    print(f"{'Modo':<12} {'Escala':>6} {'Tempo (ms)':>11} {'Aceleração':>11} "
+          f"{'Erro máx.':>10} {'Tolerância':>11} {'vs serial':>10}  Status")
+
+    baseline = {scale: elapsed for mode, scale, elapsed, _, _ in results if mode == 'exact'}
+    for mode, scale, elapsed, errors, serial_errors in results:
+        tolerance = MODES[mode]['tolerance']
+        worst = _worst(errors)
+        serial_worst = _worst(serial_errors)
+        ok = worst != 'forma' and worst <= tolerance and serial_worst in ('-', 0)
+        speedup = baseline[scale] / elapsed if scale in baseline and elapsed > 0 else float('nan')
+        print(f"{mode:<12} {scale:>5}x {elapsed * 1000:>11.2f} {speedup:>10.2f}x "
+              f"{worst:>10} {tolerance:>11} {serial_worst:>10}  {'OK' if ok else 'FALHOU'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara todos os modos do upscaler com as saídas de referência."
+    )
+    parser.add_argument('--update', action='store_true',
+                        help="regenera as saídas de referência a partir da implementação original")
+    args = parser.parse_args()
+
+    fixtures = build_fixtures()
+
+    if args.update:
+        save_golden(generate_golden(fixtures))
+        print(f"Referências salvas em {GOLDEN_PATH}")
+
+    golden = load_golden()
+    warm_up(fixtures)
+    results = []
+    for scale in SCALES:
+        for mode in MODES:
+            elapsed, errors, serial_errors = compare_mode(mode, fixtures, golden, scale)
+            results.append((mode, scale, elapsed, errors, serial_errors))
+
+    print_report(results)
+
+
+if __name__ == "__main__":
+    main()
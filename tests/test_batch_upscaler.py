@@ -0,0 +1,86 @@
+import os
+import signal
+import time
+
+import numpy as np
+import pytest
+
+from batch_upscaler import SharedMemoryBatchUpscaler
+from benchmark import make_frames
+from main import SimplePolarizationUpscaler
+
+
+@pytest.fixture
+def runner():
+    with SharedMemoryBatchUpscaler(workers=2) as runner:
+        yield runner
+
+
+def _assert_matches_serial(frames, outputs, scale):
+    upscaler = SimplePolarizationUpscaler()
+    for frame, output in zip(frames, outputs):
+        np.testing.assert_array_equal(output, upscaler.polarization_upscale(frame, scale=scale))
+
+
+def test_good_batch_after_failed_frame(runner):
+    bad = np.zeros((100, 150, 2), dtype=np.uint8)
+    with pytest.raises(RuntimeError):
+        runner.run([bad] + make_frames(6, (100, 150), seed=1), scale=2)
+
+    frames = make_frames(6, (100, 150), seed=2)
+    _assert_matches_serial(frames, runner.run(frames, scale=2), 2)
+
+
+def test_good_batch_after_failed_callback(runner):
+    def fail(job, output):
+        raise ValueError("falha no consumidor")
+
+    with pytest.raises(ValueError):
+        runner.run(make_frames(6, (100, 150), seed=1), scale=2, on_result=fail)
+
+    frames = make_frames(6, (100, 150), seed=2)
+    _assert_matches_serial(frames, runner.run(frames, scale=2), 2)
+
+
+def test_recovers_after_worker_is_killed():
+    runner = SharedMemoryBatchUpscaler(workers=2).start()
+    try:
+        os.kill(runner._processes[0].pid, signal.SIGKILL)
+        runner._processes[0].join()
+
+        frames = make_frames(6, (100, 150), seed=3)
+        _assert_matches_serial(frames, runner.run(frames, scale=2), 2)
+    finally:
+        started = time.perf_counter()
+        runner.close()
+        assert time.perf_counter() - started < runner.join_timeout
+
+
+def test_worker_killed_mid_batch_then_recovers():
+    runner = SharedMemoryBatchUpscaler(workers=2).start()
+    try:
+        victim = runner._processes[0].pid
+
+        frames = make_frames(12, (100, 150), seed=1)
+        outputs = {}
+
+        def kill_once(job, output):
+            if job == 0:
+                os.kill(victim, signal.SIGKILL)
+            outputs[job] = output.copy()
+
+        # Conforme o worker morto tinha ou não uma tarefa (ou o lock da fila),
+        # o lote falha ou é concluído pelo outro worker; ambos são aceitáveis.
+        try:
+            runner.run(frames, scale=2, on_result=kill_once)
+        except RuntimeError:
+            pass
+        else:
+            _assert_matches_serial(frames, [outputs[i] for i in range(len(frames))], 2)
+
+        frames = make_frames(6, (100, 150), seed=2)
+        _assert_matches_serial(frames, runner.run(frames, scale=2), 2)
+    finally:
+        started = time.perf_counter()
+        runner.close()
+        assert time.perf_counter() - started < runner.join_timeout
@@ -0,0 +1,26 @@
+import pytest
+
+from tests.equivalence import MODES, SCALES, compare_mode, golden_key
+
+
+def test_golden_covers_every_fixture(fixtures, golden):
+    expected = {golden_key(name, scale) for name in fixtures for scale in SCALES}
+    assert expected == set(golden)
+
+
+@pytest.mark.parametrize('scale', SCALES)
+@pytest.mark.parametrize('mode', list(MODES))
+def test_mode_matches_golden(mode, scale, fixtures, golden, mode_results):
+    elapsed, errors, serial_errors = compare_mode(mode, fixtures, golden, scale)
+    mode_results.append((mode, scale, elapsed, errors, serial_errors))
+
+    tolerance = MODES[mode]['tolerance']
+    wrong_shape = [name for name, error in errors.items() if error is None]
+    assert not wrong_shape, f"Formato diferente da referência: {wrong_shape}"
+
+    too_far = {name: error for name, error in errors.items() if error > tolerance}
+    assert not too_far, f"Erro acima de {tolerance} nível(is): {too_far}"
+
+    if serial_errors is not None:
+        different = {name: error for name, error in serial_errors.items() if error != 0}
+        assert not different, f"Diferente da saída serial de {MODES[mode]['serial']!r}: {different}"
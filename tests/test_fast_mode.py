@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from main import SimplePolarizationUpscaler
+
+PHASE_LUT_MAX_ERROR = np.pi / (4 * SimplePolarizationUpscaler.PHASE_LUT_SIZE)
+
+
+@pytest.mark.parametrize('angle', [0, 30, 45, 90, 137, 180, 270])
+def test_pattern_shape_does_not_depend_on_mode(angle):
+    upscaler = SimplePolarizationUpscaler()
+    for mode in SimplePolarizationUpscaler.modes:
+        assert upscaler.polarization_pattern(48, 64, angle, mode).shape == (48, 64)
+
+
+@pytest.mark.parametrize('angle', [0, 90, 180, 270])
+def test_axis_aligned_fast_pattern_matches_exact(angle):
+    upscaler = SimplePolarizationUpscaler()
+    exact = upscaler.polarization_pattern(300, 400, angle, 'exact')
+    fast = upscaler.polarization_pattern(300, 400, angle, 'fast')
+    assert np.abs(exact - fast).max() < 1e-12
+
+
+@pytest.mark.parametrize('angle', [15, 30, 45, 60, 137, 301])
+def test_phase_lut_pattern_within_documented_error(angle):
+    upscaler = SimplePolarizationUpscaler()
+    exact = upscaler.polarization_pattern(300, 400, angle, 'exact')
+    fast = upscaler.polarization_pattern(300, 400, angle, 'fast')
+    assert np.abs(exact - fast).max() <= PHASE_LUT_MAX_ERROR